@@ -20,6 +20,15 @@ class Settings(BaseSettings):
     # Form URL
     form_url: str = "https://scholarships.gov.in/scholarshipEligibility/"
     
+    # Form filler browser pool
+    form_filler_pool_size: int = 2
+    form_filler_max_uses: int = 20
+    # Cap on the best-effort wait for the form page to settle before filling
+    form_settle_timeout: float = 2.0
+    
+    # Screenshots older than this are deleted in the background
+    screenshot_retention_days: int = 7
+    
     # Server settings
     host: str = "0.0.0.0"
     port: int = 8000
@@ -30,7 +39,12 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get cached settings instance"""
     return Settings()
+
+
+# Settings are immutable for the process lifetime; hot paths import this
+# instance directly instead of calling get_settings() per request.
+settings = get_settings()
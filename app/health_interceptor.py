@@ -0,0 +1,58 @@
+"""Pure ASGI interceptor that answers probe endpoints ahead of the FastAPI stack"""
+from typing import Any, Awaitable, Callable, Dict
+
+# Returns the pre-serialized JSON body for a probe path
+BodyProvider = Callable[[], Awaitable[bytes]]
+
+_METHOD_NOT_ALLOWED_BODY = b'{"detail":"Method Not Allowed"}'
+
+
+class HealthCheckInterceptor:
+    """
+    Short-circuit GET requests on probe paths (e.g. /health) with a JSON body
+    produced by the path's provider, skipping middleware, routing and
+    validation. Everything else, including lifespan events, is passed through
+    to the wrapped app.
+
+    Requests carrying an Origin header fall through so CORS headers are still
+    applied by the wrapped app.
+    """
+
+    def __init__(self, app, paths: Dict[str, BodyProvider]):
+        self.app = app
+        self.paths = paths
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose the wrapped app's attributes (state, routes, openapi, ...)
+        return getattr(self.app, name)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            provider = self.paths.get(scope["path"])
+            if provider is not None and not self._has_origin(scope):
+                if scope["method"] == "GET":
+                    await self._send_json(send, 200, await provider())
+                else:
+                    await self._send_json(
+                        send, 405, _METHOD_NOT_ALLOWED_BODY, [(b"allow", b"GET")]
+                    )
+                return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _has_origin(scope) -> bool:
+        return any(name == b"origin" for name, _ in scope["headers"])
+
+    @staticmethod
+    async def _send_json(send, status: int, body: bytes, extra_headers=()):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                *extra_headers
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,33 +1,107 @@
 """FastAPI main application entry point"""
+import asyncio
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Tuple
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import httpx
+import orjson
 
 from . import __version__
-from .config import get_settings
+from .config import settings
 from .routers import session_router, form_router
 from .models import HealthResponse
+from .services import (
+    ExtractionService,
+    SpeechService,
+    FormFillerService,
+    get_session_manager
+)
+from .health_interceptor import HealthCheckInterceptor
+
+
+logger = logging.getLogger(__name__)
+
+# Newer FastAPI serializes response models straight to JSON bytes through
+# Pydantic and deprecates ORJSONResponse; only use orjson on older releases.
+# On newer ones the argument is left out entirely: any explicit response
+# class, even JSONResponse, disables that fast path.
+_RESPONSE_CLASS_KWARGS = (
+    {} if getattr(ORJSONResponse, "__deprecated__", None)
+    else {"default_response_class": ORJSONResponse}
+)
+
+
+def _start_logging() -> Tuple[QueueHandler, QueueListener]:
+    """Route root logging through a queue so handler I/O runs off the event loop"""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    
+    queue_handler = QueueHandler(log_queue)
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(logging.DEBUG if settings.debug else logging.INFO)
+    # httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return queue_handler, listener
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
-    print("[*] Scholarship Form-Filling API starting...")
-    settings = get_settings()
-    print(f"    Ollama URL: {settings.ollama_url}")
-    print(f"    Ollama Model: {settings.ollama_model}")
-    print(f"    Form URL: {settings.form_url}")
+    queue_handler, log_listener = _start_logging()
+    logger.info("Scholarship Form-Filling API starting...")
+    logger.info("Ollama URL: %s", settings.ollama_url)
+    logger.info("Ollama Model: %s", settings.ollama_model)
+    logger.info("Form URL: %s", settings.form_url)
+    
+    # Shared HTTP client so upstream calls reuse pooled keep-alive connections
+    app.state.http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    )
+    
+    # Services are process-wide singletons resolved by the router dependencies
+    app.state.extraction_service = ExtractionService(app.state.http_client)
+    app.state.speech_service = SpeechService()
+    app.state.form_filler = FormFillerService()
+    
+    # Expired sessions and old screenshots are swept in the background,
+    # off the request path
+    cleanup_tasks = [
+        asyncio.create_task(get_session_manager().run_cleanup()),
+        asyncio.create_task(app.state.form_filler.run_screenshot_cleanup())
+    ]
     
     yield
     
     # Shutdown
-    print("[*] Scholarship Form-Filling API shutting down...")
+    logger.info("Scholarship Form-Filling API shutting down...")
+    for task in cleanup_tasks:
+        task.cancel()
+    await asyncio.gather(*cleanup_tasks, return_exceptions=True)
+    await app.state.http_client.aclose()
+    await app.state.speech_service.aclose()
+    await asyncio.to_thread(app.state.form_filler.close)
+    
+    log_listener.stop()
+    logging.getLogger().removeHandler(queue_handler)
 
 
 # Create FastAPI app
-app = FastAPI(
+fastapi_app = FastAPI(
     title="Scholarship Form-Filling API",
     description="""
 ## Scholarship Form-Filling API
@@ -54,11 +128,12 @@ The scholarship website requires CAPTCHA completion which cannot be automated.
     version=__version__,
     lifespan=lifespan,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    **_RESPONSE_CLASS_KWARGS
 )
 
 # CORS middleware for web access
-app.add_middleware(
+fastapi_app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Configure for production
     allow_credentials=True,
@@ -67,61 +142,95 @@ app.add_middleware(
 )
 
 # Include routers
-app.include_router(session_router)
-app.include_router(form_router)
+fastapi_app.include_router(session_router)
+fastapi_app.include_router(form_router)
+
 
+ROOT_INFO = {
+    "name": "Scholarship Form-Filling API",
+    "version": __version__,
+    "documentation": "/docs",
+    "health": "/health"
+}
+_ROOT_BODY = orjson.dumps(ROOT_INFO)
 
-@app.get("/", tags=["Root"])
+
+@fastapi_app.get("/", tags=["Root"])
 async def root():
     """API root endpoint"""
-    return {
-        "name": "Scholarship Form-Filling API",
-        "version": __version__,
-        "documentation": "/docs",
-        "health": "/health"
-    }
+    return ROOT_INFO
 
 
-@app.get("/health", response_model=HealthResponse, tags=["Health"])
-async def health_check():
-    """Health check endpoint"""
-    settings = get_settings()
-    
-    # Check Ollama
-    ollama_status = "unknown"
-    try:
-        async with httpx.AsyncClient(timeout=3.0) as client:
-            response = await client.get(f"{settings.ollama_url}/api/tags")
-            if response.status_code == 200:
-                ollama_status = "healthy"
-            else:
-                ollama_status = "unhealthy"
-    except Exception:
-        ollama_status = "unreachable"
+# Cached health result so frequent probes don't hit upstreams every time
+HEALTH_CACHE_TTL = 5.0
+_health_cache = {"ts": 0.0, "value": None, "body": b""}
+
+
+async def _probe_ollama(client: httpx.AsyncClient) -> str:
+    """Probe Ollama's model listing endpoint"""
+    response = await client.get(f"{settings.ollama_url}/api/tags", timeout=3.0)
+    return "healthy" if response.status_code == 200 else "unhealthy"
+
+
+async def _probe_bhashini(client: httpx.AsyncClient) -> str:
+    """Ping the Bhashini pipeline endpoint"""
+    response = await client.options(settings.bhashini_url, timeout=3.0)
+    return "healthy" if response.status_code < 500 else "unhealthy"
+
+
+async def _get_health(client: httpx.AsyncClient) -> HealthResponse:
+    """Return the cached health result, re-probing upstreams once it is stale"""
+    now = time.monotonic()
+    if _health_cache["value"] is not None and now - _health_cache["ts"] < HEALTH_CACHE_TTL:
+        return _health_cache["value"]
     
-    # Check Bhashini (just ping)
-    bhashini_status = "unknown"
-    try:
-        async with httpx.AsyncClient(timeout=3.0) as client:
-            response = await client.options(settings.bhashini_url)
-            if response.status_code < 500:
-                bhashini_status = "healthy"
-            else:
-                bhashini_status = "unhealthy"
-    except Exception:
-        bhashini_status = "unreachable"
+    # Probes run concurrently; a probe that raised counts as unreachable
+    results = await asyncio.gather(
+        _probe_ollama(client),
+        _probe_bhashini(client),
+        return_exceptions=True
+    )
+    ollama_status, bhashini_status = (
+        "unreachable" if isinstance(result, BaseException) else result
+        for result in results
+    )
     
-    return HealthResponse(
+    health = HealthResponse(
         status="healthy" if ollama_status == "healthy" else "degraded",
         version=__version__,
         ollama_status=ollama_status,
         bhashini_status=bhashini_status
     )
+    _health_cache["ts"] = time.monotonic()
+    _health_cache["value"] = health
+    _health_cache["body"] = health.model_dump_json().encode("utf-8")
+    return health
 
 
-@app.get("/stats", tags=["Admin"])
+@fastapi_app.get("/health", response_model=HealthResponse, tags=["Health"])
+async def health_check(request: Request):
+    """Health check endpoint"""
+    return await _get_health(request.app.state.http_client)
+
+
+@fastapi_app.get("/stats", tags=["Admin"])
 async def get_stats():
     """Get API statistics"""
-    from .services import get_session_manager
     session_manager = get_session_manager()
     return session_manager.get_stats()
+
+
+async def _health_body() -> bytes:
+    await _get_health(fastapi_app.state.http_client)
+    return _health_cache["body"]
+
+
+async def _root_body() -> bytes:
+    return _ROOT_BODY
+
+
+# Probe endpoints are answered before the FastAPI middleware/routing stack
+app = HealthCheckInterceptor(fastapi_app, {
+    "/": _root_body,
+    "/health": _health_body
+})
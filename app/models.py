@@ -1,6 +1,6 @@
 """Pydantic models for API request/response schemas"""
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any, List, TypedDict
 from datetime import datetime
 from enum import Enum
 
@@ -40,7 +40,7 @@ class SessionResponse(BaseModel):
     """Response when creating/querying a session"""
     session_id: str
     status: SessionStatus
-    created_at: datetime
+    created_at: datetime  # Sessions pass a Unix timestamp; parsed as UTC
     current_group_index: int
     total_groups: int
     message: str = ""
@@ -55,8 +55,31 @@ class QuestionGroup(BaseModel):
     is_last: bool
 
 
+class ExtractedDataDict(TypedDict, total=False):
+    """Plain-dict form of ExtractedData used inside the session store"""
+    name: Optional[str]
+    gender: Optional[str]
+    d_state_id: Optional[str]
+    religion: Optional[str]
+    community: Optional[str]
+    annual_family_income: Optional[str]
+    c_course_id: Optional[str]
+    maritalStatus: Optional[str]
+    hosteler: Optional[str]
+    dob: Optional[str]
+    xii_roll_no: Optional[str]
+    twelfthPercentage: Optional[str]
+    x_roll_no: Optional[str]
+    tenthPercentage: Optional[str]
+    parent_profession: Optional[str]
+    competitiveExam: Optional[str]
+    competitiveRollno: Optional[str]
+
+
 class ExtractedData(BaseModel):
     """Extracted scholarship form data"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     name: Optional[str] = None
     gender: Optional[str] = None
     d_state_id: Optional[str] = None
@@ -109,6 +132,8 @@ class FormFillingResponse(BaseModel):
     message: str
     screenshot_url: Optional[str] = None
     errors: List[str] = []
+    job_id: Optional[str] = None
+    progress: Optional[str] = None  # e.g. "Selecting gender (4/7 fields)"
 
 
 class ErrorResponse(BaseModel):
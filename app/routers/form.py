@@ -1,6 +1,8 @@
 """Form filling API endpoints"""
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from fastapi.responses import FileResponse
+from typing import Any, Dict, Optional, Set
+import asyncio
 import os
 
 from ..models import (
@@ -13,26 +15,103 @@ from ..services import (
     get_session_manager,
     FormFillerService
 )
+from ..services.session_manager import Session
 
 router = APIRouter(prefix="/form", tags=["Form"])
 
+# Preview labels for form fields
+TEXT_FIELD_LABELS = {
+    "name": "Full Name",
+    "annual_family_income": "Annual Family Income",
+    "xii_roll_no": "12th Roll Number",
+    "twelfthPercentage": "12th Percentage",
+    "x_roll_no": "10th Roll Number",
+    "tenthPercentage": "10th Percentage",
+    "competitiveRollno": "Competitive Exam Roll No",
+    "dob": "Date of Birth"
+}
 
-def get_form_filler() -> FormFillerService:
-    return FormFillerService()
+DROPDOWN_FIELD_LABELS = {
+    "d_state_id": "State",
+    "gender": "Gender",
+    "religion": "Religion",
+    "community": "Community/Category",
+    "maritalStatus": "Marital Status",
+    "c_course_id": "Course",
+    "parent_profession": "Parent Profession",
+    "hosteler": "Hosteler",
+    "competitiveExam": "Competitive Exam"
+}
+
+_TEXT_KEYS = frozenset(TEXT_FIELD_LABELS)
+_DROPDOWN_KEYS = frozenset(DROPDOWN_FIELD_LABELS)
+
+# Screenshot media types by file extension (older screenshots are PNG)
+_SCREENSHOT_MEDIA_TYPES = {".jpg": "image/jpeg", ".png": "image/png"}
+
+# Strong references to in-flight result recorders (the loop only keeps weak ones)
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def get_form_filler(request: Request) -> FormFillerService:
+    return request.app.state.form_filler
+
+
+def _screenshot_url(session_id: str, screenshot_path: str) -> str:
+    """Screenshot URL versioned by file name, so each refill gets a new URL"""
+    return f"/form/{session_id}/screenshot?v={os.path.basename(screenshot_path)}"
+
+
+def _format_progress(progress: Dict[str, Any]) -> Optional[str]:
+    if not progress:
+        return None
+    return f"{progress['step']} ({progress['fields_done']}/{progress['fields_total']} fields)"
+
+
+async def _record_fill_result(session: Session, form_filler: FormFillerService, job_id: str):
+    """Wait for a fill job and store its outcome on the session"""
+    success, message, errors, screenshot_path = await form_filler.await_job(job_id)
+    
+    session.form_filling_status = "completed" if success else "failed"
+    session.form_screenshot_path = screenshot_path
+    # Stat the new screenshot once here so GET /screenshot needs no syscall
+    try:
+        session.form_screenshot_stat = (
+            await asyncio.to_thread(os.stat, screenshot_path) if screenshot_path else None
+        )
+    except OSError:
+        session.form_screenshot_stat = None
+    session.form_errors = errors
+    
+    status = FormFillingStatus.CAPTCHA_REQUIRED if success else FormFillingStatus.FAILED
+    return FormFillingResponse(
+        session_id=session.session_id,
+        status=status,
+        message=message,
+        screenshot_url=_screenshot_url(session.session_id, screenshot_path) if screenshot_path else None,
+        errors=errors,
+        job_id=job_id
+    )
 
 
 @router.post(
     "/{session_id}/fill",
     response_model=FormFillingResponse,
     summary="Fill scholarship form",
-    description="Fill the scholarship eligibility form with session data",
+    description=(
+        "Start filling the scholarship eligibility form with session data. "
+        "Returns immediately with a job ID; poll GET /form/{id}/status for "
+        "progress, or pass wait=true to block until filling finishes."
+    ),
     responses={
         404: {"model": ErrorResponse},
-        400: {"model": ErrorResponse}
+        400: {"model": ErrorResponse},
+        409: {"model": ErrorResponse}
     }
 )
 async def fill_form(
     session_id: str,
+    wait: bool = Query(False, description="Wait for filling to finish and return the result"),
     session_manager: SessionManager = Depends(get_session_manager),
     form_filler: FormFillerService = Depends(get_form_filler)
 ):
@@ -48,34 +127,27 @@ async def fill_form(
             detail="No data collected yet. Please provide information first."
         )
     
+    if session.form_filling_status == "in_progress":
+        raise HTTPException(status_code=409, detail="Form filling already in progress")
+    
     # Update session status
     session.form_filling_status = "in_progress"
     
-    # Fill form
-    success, message, errors, screenshot_path = await form_filler.fill_form(
-        filled_data, 
-        session_id
-    )
-    
-    # Update session
-    session.form_filling_status = "completed" if success else "failed"
-    session.form_screenshot_path = screenshot_path
-    session.form_errors = errors
+    # Fill form in the background; the recorder updates the session when done
+    job_id = form_filler.start_fill(filled_data, session_id)
+    session.form_job_id = job_id
+    task = asyncio.create_task(_record_fill_result(session, form_filler, job_id))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
     
-    # Determine status
-    if success and not errors:
-        status = FormFillingStatus.CAPTCHA_REQUIRED
-    elif success and errors:
-        status = FormFillingStatus.CAPTCHA_REQUIRED
-    else:
-        status = FormFillingStatus.FAILED
+    if wait:
+        return await asyncio.shield(task)
     
     return FormFillingResponse(
         session_id=session_id,
-        status=status,
-        message=message,
-        screenshot_url=f"/form/{session_id}/screenshot" if screenshot_path else None,
-        errors=errors
+        status=FormFillingStatus.IN_PROGRESS,
+        message="Form filling started. Poll the status endpoint for progress.",
+        job_id=job_id
     )
 
 
@@ -87,7 +159,8 @@ async def fill_form(
 )
 async def get_form_status(
     session_id: str,
-    session_manager: SessionManager = Depends(get_session_manager)
+    session_manager: SessionManager = Depends(get_session_manager),
+    form_filler: FormFillerService = Depends(get_form_filler)
 ):
     """Get the current status of form filling"""
     session = session_manager.get_session(session_id)
@@ -101,26 +174,42 @@ async def get_form_status(
         "failed": FormFillingStatus.FAILED
     }
     
+    progress = None
+    if session.form_filling_status == "in_progress" and session.form_job_id:
+        job = form_filler.get_job_status(session.form_job_id)
+        if job:
+            progress = _format_progress(job["progress"])
+    
     return FormFillingResponse(
         session_id=session_id,
         status=status_map.get(session.form_filling_status, FormFillingStatus.PENDING),
         message=f"Form filling status: {session.form_filling_status}",
-        screenshot_url=f"/form/{session_id}/screenshot" if session.form_screenshot_path else None,
-        errors=session.form_errors
+        screenshot_url=(
+            _screenshot_url(session_id, session.form_screenshot_path)
+            if session.form_screenshot_path else None
+        ),
+        errors=session.form_errors,
+        job_id=session.form_job_id,
+        progress=progress
     )
 
 
 @router.get(
     "/{session_id}/screenshot",
     summary="Get form screenshot",
-    description="Get the screenshot of the filled form",
+    description=(
+        "Get the screenshot of the filled form. The versioned URL returned by "
+        "the fill/status endpoints is cacheable; the bare URL always serves "
+        "the latest screenshot and must be revalidated."
+    ),
     responses={
         404: {"description": "Screenshot not found"},
-        200: {"content": {"image/png": {}}}
+        200: {"content": {"image/jpeg": {}, "image/png": {}}}
     }
 )
 async def get_screenshot(
     session_id: str,
+    v: Optional[str] = Query(None, description="Screenshot version from screenshot_url"),
     session_manager: SessionManager = Depends(get_session_manager),
     form_filler: FormFillerService = Depends(get_form_filler)
 ):
@@ -129,15 +218,35 @@ async def get_screenshot(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found or expired")
     
-    screenshot_path = session.form_screenshot_path or form_filler.get_screenshot_path(session_id)
+    screenshot_path = session.form_screenshot_path
+    stat_result = session.form_screenshot_stat
     
-    if not screenshot_path or not os.path.exists(screenshot_path):
-        raise HTTPException(status_code=404, detail="Screenshot not found")
+    if not screenshot_path or stat_result is None:
+        screenshot_path = form_filler.get_screenshot_path(session_id)
+        if not screenshot_path:
+            raise HTTPException(status_code=404, detail="Screenshot not found")
+        
+        # One stat (off the event loop) serves both the existence check and
+        # FileResponse's headers
+        try:
+            stat_result = await asyncio.to_thread(os.stat, screenshot_path)
+        except OSError:
+            raise HTTPException(status_code=404, detail="Screenshot not found")
     
+    # Refills write a new file behind the same path, so only a URL naming
+    # this exact file may be cached; anything else must be refetched
+    if v == os.path.basename(screenshot_path):
+        cache_control = "private, max-age=86400, immutable"
+    else:
+        cache_control = "no-cache"
+    
+    ext = os.path.splitext(screenshot_path)[1]
     return FileResponse(
         screenshot_path,
-        media_type="image/png",
-        filename=f"form_{session_id}.png"
+        media_type=_SCREENSHOT_MEDIA_TYPES.get(ext, "application/octet-stream"),
+        filename=f"form_{session_id}{ext}",
+        stat_result=stat_result,
+        headers={"Cache-Control": cache_control}
     )
 
 
@@ -157,42 +266,19 @@ async def preview_form_data(
     
     filled_data = session.get_filled_data()
     
-    # Map to form fields for preview
-    text_fields = {
-        "name": "Full Name",
-        "annual_family_income": "Annual Family Income",
-        "xii_roll_no": "12th Roll Number",
-        "twelfthPercentage": "12th Percentage",
-        "x_roll_no": "10th Roll Number",
-        "tenthPercentage": "10th Percentage",
-        "competitiveRollno": "Competitive Exam Roll No",
-        "dob": "Date of Birth"
-    }
-    
-    dropdown_fields = {
-        "d_state_id": "State",
-        "gender": "Gender",
-        "religion": "Religion",
-        "community": "Community/Category",
-        "maritalStatus": "Marital Status",
-        "c_course_id": "Course",
-        "parent_profession": "Parent Profession",
-        "hosteler": "Hosteler",
-        "competitiveExam": "Competitive Exam"
-    }
+    # Map to form field labels in a single pass
+    text_preview = {}
+    dropdown_preview = {}
+    for key, value in filled_data.items():
+        if key in _TEXT_KEYS:
+            text_preview[TEXT_FIELD_LABELS[key]] = value
+        elif key in _DROPDOWN_KEYS:
+            dropdown_preview[DROPDOWN_FIELD_LABELS[key]] = value
     
     preview = {
         "session_id": session_id,
-        "text_fields": {
-            text_fields.get(k, k): v 
-            for k, v in filled_data.items() 
-            if k in text_fields
-        },
-        "dropdown_fields": {
-            dropdown_fields.get(k, k): v 
-            for k, v in filled_data.items() 
-            if k in dropdown_fields
-        },
+        "text_fields": text_preview,
+        "dropdown_fields": dropdown_preview,
         "total_fields_filled": len(filled_data),
         "ready_to_fill": len(filled_data) >= 3  # At least 3 fields
     }
@@ -1,5 +1,5 @@
 """Session management API endpoints"""
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
+from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Request
 from typing import Optional
 
 from ..models import (
@@ -22,12 +22,12 @@ from ..services import (
 router = APIRouter(prefix="/session", tags=["Session"])
 
 
-def get_speech_service() -> SpeechService:
-    return SpeechService()
+def get_speech_service(request: Request) -> SpeechService:
+    return request.app.state.speech_service
 
 
-def get_extraction_service() -> ExtractionService:
-    return ExtractionService()
+def get_extraction_service(request: Request) -> ExtractionService:
+    return request.app.state.extraction_service
 
 
 @router.post(
@@ -47,7 +47,7 @@ async def start_session(
         status=session.status,
         created_at=session.created_at,
         current_group_index=session.group_index,
-        total_groups=len(session_manager.QUESTION_GROUPS),
+        total_groups=session_manager.NUM_GROUPS,
         message="Session created. Start by getting current questions with GET /session/{id}/questions"
     )
 
@@ -72,7 +72,7 @@ async def get_session(
         status=session.status,
         created_at=session.created_at,
         current_group_index=session.group_index,
-        total_groups=len(session_manager.QUESTION_GROUPS),
+        total_groups=session_manager.NUM_GROUPS,
         message=""
     )
 
@@ -117,22 +117,18 @@ async def process_text(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found or expired")
     
-    # Add to chat history
-    session.add_message("user", text_input.text)
-    
-    # Extract data using LLM
+    # Extract data using LLM (the new input is appended after the history)
     extracted = await extraction_service.extract(
         text_input.text,
         session.chat_history
     )
     
-    fields_updated = []
-    if extracted:
-        fields_updated = session.update_data(extracted)
-        session.add_message("assistant", f"Extracted: {extracted}")
-    
-    # Advance to next question group
-    session.advance_group()
+    # Record the turn and advance to next question group
+    fields_updated = session.commit_turn(
+        text_input.text,
+        extracted,
+        f"Extracted: {extracted}" if extracted else None
+    )
     
     return TextProcessResponse(
         session_id=session_id,
@@ -162,34 +158,29 @@ async def process_audio(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found or expired")
     
-    # Read audio file
-    audio_bytes = await audio.read()
-    if not audio_bytes:
+    if not audio.size:
         raise HTTPException(status_code=400, detail="Empty audio file")
     
-    # Transcribe audio
-    transcribed_text = await speech_service.transcribe_audio(audio_bytes)
+    # Transcribe audio (streamed from the spooled upload, not read into memory)
+    transcribed_text = await speech_service.transcribe_audio(audio.file)
     if not transcribed_text:
         raise HTTPException(
             status_code=400, 
             detail="Could not transcribe audio. Please speak clearly and try again."
         )
     
-    # Add to chat history
-    session.add_message("user", transcribed_text)
-    
-    # Extract data using LLM  
+    # Extract data using LLM (the new input is appended after the history)
     extracted = await extraction_service.extract(
         transcribed_text,
         session.chat_history
     )
     
-    if extracted:
-        session.update_data(extracted)
-        session.add_message("assistant", f"Extracted: {extracted}")
-    
-    # Advance to next question group
-    session.advance_group()
+    # Record the turn and advance to next question group
+    session.commit_turn(
+        transcribed_text,
+        extracted,
+        f"Extracted: {extracted}" if extracted else None
+    )
     
     return TranscriptionResponse(
         session_id=session_id,
@@ -252,7 +243,7 @@ async def skip_group(
         status=SessionStatus.COMPLETED if is_finished else SessionStatus.ACTIVE,
         created_at=session.created_at,
         current_group_index=session.group_index,
-        total_groups=len(session_manager.QUESTION_GROUPS),
+        total_groups=session_manager.NUM_GROUPS,
         message="Question group skipped." if not is_finished else "All question groups completed."
     )
 
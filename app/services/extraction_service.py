@@ -1,10 +1,18 @@
 """LLM-based extraction service using Ollama"""
 import re
 import json
+import logging
 import httpx
-from typing import Dict, Any, Optional, List
+import orjson
+from typing import Dict, Any, Optional, Iterable, List, ClassVar
 
-from ..config import get_settings
+from ..config import settings
+from .session_manager import MAX_MESSAGE_CHARS
+
+logger = logging.getLogger(__name__)
+
+# Fallback for replies that wrap the JSON object in extra text
+_JSON_RE = re.compile(r"\{[\s\S]*\}")
 
 
 class ExtractionService:
@@ -40,20 +48,38 @@ Sweepers / Tanner / Waste Pickers
 
 Current conversation:"""
 
-    def __init__(self):
-        self._settings = get_settings()
+    # Static leading messages shared by every request
+    _PREFIX_MESSAGES: ClassVar[List[Dict[str, str]]] = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": INSTRUCTION_PROMPT}
+    ]
+
+    def __init__(self, client: httpx.AsyncClient):
+        self._client = client
+        self._chat_url = f"{settings.ollama_url}/api/chat"
+        # Serialize the static part of the request body once. "messages" is
+        # the last key, so dropping the closing ']}' leaves the array open
+        # for the per-call messages to be appended.
+        static_body = orjson.dumps({
+            "model": settings.ollama_model,
+            "stream": False,
+            "format": "json",
+            "options": {"temperature": 0.15},
+            "messages": self._PREFIX_MESSAGES
+        })
+        self._body_prefix = static_body[:-2] + b","
     
     async def extract(
         self, 
         user_input: str, 
-        chat_history: List[Dict[str, str]]
+        chat_history: Iterable[Dict[str, str]]
     ) -> Optional[Dict[str, Any]]:
         """
         Extract structured data from user input using conversation context.
         
         Args:
             user_input: Latest user input text
-            chat_history: Previous conversation messages
+            chat_history: Previous conversation messages (already capped by the session)
             
         Returns:
             Extracted data dictionary or None if failed
@@ -61,57 +87,56 @@ Current conversation:"""
         if not user_input.strip():
             return None
         
-        # Build messages for LLM
-        messages = [
-            {"role": "system", "content": self.SYSTEM_PROMPT},
-            {"role": "user", "content": self.INSTRUCTION_PROMPT},
-            *chat_history[-12:],  # Last 12 messages for context
-            {"role": "user", "content": user_input}
-        ]
+        # Build the per-call messages; the static prefix is already serialized
+        messages = orjson.dumps([
+            *chat_history,
+            {"role": "user", "content": user_input[:MAX_MESSAGE_CHARS]}
+        ])
+        body = b"".join((self._body_prefix, messages[1:], b"}"))
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self._settings.ollama_url}/api/chat",
-                    json={
-                        "model": self._settings.ollama_model,
-                        "messages": messages,
-                        "stream": False,
-                        "temperature": 0.15
-                    }
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                content = result.get("message", {}).get("content", "").strip()
-                
-                # Extract JSON from response
-                json_match = re.search(r'\{[\s\S]*\}', content)
-                if json_match:
-                    extracted = json.loads(json_match.group(0))
-                    return extracted
-                
-                return None
-                
-        except httpx.HTTPError as e:
-            print(f"Ollama API error: {e}")
+            response = await self._client.post(
+                self._chat_url,
+                content=body,
+                headers={"Content-Type": "application/json"},
+                timeout=60.0
+            )
+            response.raise_for_status()
+            
+            result = orjson.loads(response.content)
+            content = result.get("message", {}).get("content", "").strip()
+            
+            # format="json" makes Ollama return a single JSON object as content
+            try:
+                extracted = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                json_match = _JSON_RE.search(content)
+                if not json_match:
+                    raise
+                extracted = orjson.loads(json_match.group(0))
+            return extracted if isinstance(extracted, dict) else None
+            
+        except httpx.HTTPError:
+            logger.exception("Ollama API error")
             return None
-        except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {e}")
+        except (orjson.JSONDecodeError, json.JSONDecodeError):
+            logger.exception("JSON parsing error")
             return None
-        except Exception as e:
-            print(f"Extraction error: {e}")
+        except Exception:
+            logger.exception("Extraction error")
             return None
     
     async def check_health(self) -> bool:
         """Check if Ollama is running and model is available"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self._settings.ollama_url}/api/tags")
-                if response.status_code == 200:
-                    tags = response.json()
-                    models = [m.get("name", "") for m in tags.get("models", [])]
-                    return any(self._settings.ollama_model in m for m in models)
-                return False
+            response = await self._client.get(
+                f"{settings.ollama_url}/api/tags",
+                timeout=5.0
+            )
+            if response.status_code == 200:
+                tags = orjson.loads(response.content)
+                models = [m.get("name", "") for m in tags.get("models", [])]
+                return any(settings.ollama_model in m for m in models)
+            return False
         except Exception:
             return False
@@ -1,15 +1,20 @@
 """Form filling service using Selenium with headless Chrome"""
-import time
 import asyncio
+import logging
 import threading
 import os
-from typing import Dict, Optional, List, Tuple
+import queue
+import time
+import uuid
+import pybase64
+from typing import Any, Callable, ClassVar, Dict, Optional, List, Tuple
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -17,15 +22,415 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 from ..config import get_settings
 
+logger = logging.getLogger(__name__)
+
+# Seconds a fill waits for a free browser before giving up
+_ACQUIRE_TIMEOUT = 120.0
+# How often a waiting fill rechecks the pool for spare launch capacity
+_ACQUIRE_POLL_INTERVAL = 1.0
+
+# How often old screenshots are purged from disk
+_SCREENSHOT_CLEANUP_INTERVAL = 3600.0
+
+# Screenshots are JPEG straight from Chrome's encoder; much smaller than PNG
+_SCREENSHOT_PARAMS = {"format": "jpeg", "quality": 70, "captureBeyondViewport": False}
+# Older screenshots may still be PNG
+_SCREENSHOT_EXTENSIONS = (".jpg", ".png")
+
+# Seconds a finished fill job stays queryable
+_JOB_RETENTION = 600.0
+
+# (success, message, errors, screenshot_path)
+FillResult = Tuple[bool, str, List[str], Optional[str]]
+
+# Requests that don't affect filling: images, fonts and analytics
+_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.woff*", "*.ttf",
+    "*google-analytics*", "*googletagmanager*", "*doubleclick*",
+]
+
+# True once the page has settled: every Angular app reports no pending
+# tasks or, when testability hooks are disabled, no new resources have
+# finished loading for arguments[0] ms (tracked across polls on window).
+# Advisory only: pages that poll or run zone-tracked timers may never
+# settle, so callers must bound the wait and fill anyway on timeout.
+_JS_PAGE_SETTLED = """
+if (window.getAllAngularTestabilities) {
+    return window.getAllAngularTestabilities().every(t => t.isStable());
+}
+const count = performance.getEntriesByType('resource').length;
+const now = performance.now();
+if (window.__ffResourceCount !== count) {
+    window.__ffResourceCount = count;
+    window.__ffResourceChangedAt = now;
+}
+return document.readyState === 'complete'
+    && now - window.__ffResourceChangedAt >= arguments[0];
+"""
+# Quiet period for the network-idle fallback
+_NETWORK_QUIET_MS = 500
+
+# Text input fields: user data key -> element id
+_TEXT_FIELD_IDS = {
+    "name": "mat-input-0",
+    "annual_family_income": "mat-input-2",
+    "xii_roll_no": "mat-input-5",
+    "twelfthPercentage": "mat-input-6",
+    "x_roll_no": "mat-input-8",
+    "tenthPercentage": "mat-input-9",
+    "competitiveRollno": "mat-input-10",
+}
+
+# Select dropdown fields: user data key -> mat-select id
+_SELECT_FIELD_IDS = {
+    "d_state_id": "mat-select-0",
+    "gender": "mat-select-2",
+    "religion": "mat-select-8",
+    "community": "mat-select-10",
+    "maritalStatus": "mat-select-4",
+    "c_course_id": "mat-select-22",
+    "parent_profession": "mat-select-6",
+    "hosteler": "mat-select-14",
+    "competitiveExam": "mat-select-28",
+}
+
+# DOB datepicker locators
+_DOB_INPUT = (By.ID, "mat-input-1")
+_PERIOD_BUTTON = (By.CSS_SELECTOR, "mat-calendar#mat-datepicker-0 button.mat-calendar-period-button")
+_MULTI_YEAR_VIEW = (By.TAG_NAME, "mat-multi-year-view")
+_XPATH_YEAR_BUTTON = (
+    "//mat-multi-year-view//button[@aria-label='{year}' or "
+    ".//span[contains(text(),'{year}') or normalize-space(.)='{year}']]"
+)
+_XPATH_MONTH_BUTTON = "//mat-year-view//button[.//span[contains(text(),'{month}')]]"
+_XPATH_DAY_BUTTON = (
+    "//mat-month-view//button[.//span[contains(@class, 'mat-calendar-body-cell-content') "
+    "and normalize-space(text())='{day}']]"
+)
+
+# Month labels in the datepicker's year view, indexed by month number
+_MONTH_ABBR = ("", "JAN", "FEB", "MAR", "APR", "MAY", "JUN",
+               "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+
+# DOB separator -> reorders the split parts into (day, month, year)
+_DOB_PART_ORDER: Dict[str, Callable[[List[str]], List[str]]] = {
+    "/": lambda parts: parts,  # DD/MM/YYYY
+    "-": lambda parts: parts[::-1] if len(parts[0]) == 4 else parts,  # YYYY-MM-DD or DD-MM-YYYY
+}
+
+
+def _parse_dob(dob_str: str) -> Optional[Tuple[str, str, str]]:
+    """Parse a DOB into (day, month abbreviation, year) as the datepicker labels them"""
+    for sep, order in _DOB_PART_ORDER.items():
+        if sep in dob_str:
+            day, month, year = order(dob_str.split(sep))
+            break
+    else:
+        return None
+    
+    month_num = int(month)
+    if not 1 <= month_num <= 12:
+        return None
+    return str(int(day)), _MONTH_ABBR[month_num], year
+
+
+# Returns the open mat-option whose label equals arguments[0], or null
+_JS_FIND_OPTION = """
+const span = Array.from(document.querySelectorAll('mat-option span'))
+    .find(e => e.textContent.trim() === arguments[0]);
+return span ? span.closest('mat-option') : null;
+"""
+
+# Sets [key, element_id, value] text inputs through the native value
+# setter (bypassing any framework-patched property) and fires the events
+# Angular listens to; returns the keys whose element was not found
+_JS_FILL_TEXT_FIELDS = """
+const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+const failed = [];
+for (const [key, id, value] of arguments[0]) {
+    const el = document.getElementById(id);
+    if (!el) { failed.push(key); continue; }
+    setValue.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('blur'));
+}
+return failed;
+"""
+
+# Backdrop shown while a mat-select panel is open
+_OVERLAY_BACKDROP = (By.CSS_SELECTOR, ".cdk-overlay-backdrop-showing")
+
+# Milliseconds each in-page select step (panel open, backdrop gone) may take
+_SELECT_STEP_TIMEOUT_MS = 5000
+
+# Async script: for each [key, mat-select id, label] in arguments[0], opens
+# the select, clicks the option with that label and waits for the panel to
+# close, using a MutationObserver rather than polling from Python. Calls
+# back with [{field, success, error}] in input order, or null if the
+# script itself failed.
+_JS_FILL_SELECTS = """
+const [entries, stepTimeout] = arguments;
+const done = arguments[arguments.length - 1];
+const backdrop = () => document.querySelector('.cdk-overlay-backdrop-showing');
+const waitFor = (probe, what) => new Promise((resolve, reject) => {
+    const found = probe();
+    if (found) { resolve(found); return; }
+    const observer = new MutationObserver(() => {
+        const result = probe();
+        if (result) { observer.disconnect(); clearTimeout(timer); resolve(result); }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        reject(new Error('Timed out waiting for ' + what));
+    }, stepTimeout);
+    observer.observe(document.body, {childList: true, subtree: true, attributes: true});
+});
+const findOption = (label) => {
+    const span = Array.from(document.querySelectorAll('mat-option span'))
+        .find(e => e.textContent.trim() === label);
+    return span ? span.closest('mat-option') : null;
+};
+(async () => {
+    const results = [];
+    for (const [field, id, label] of entries) {
+        try {
+            const select = document.getElementById(id);
+            if (!select) throw new Error('Select #' + id + ' not found');
+            select.click();
+            const option = await waitFor(() => findOption(label), 'option "' + label + '"');
+            option.click();
+            await waitFor(() => !backdrop(), 'panel to close');
+            results.push({field, success: true, error: null});
+        } catch (e) {
+            // Close a panel left open so it doesn't block the next select
+            const open = backdrop();
+            if (open) {
+                open.click();
+                await waitFor(() => !backdrop(), 'panel to close').catch(() => {});
+            }
+            results.push({field, success: false, error: String(e.message || e)});
+        }
+    }
+    return results;
+})().then(done, () => done(null));
+"""
+
+
+class _BrowserPool:
+    """
+    Bounded pool of warm headless Chrome drivers.
+    
+    Drivers are checked out for one fill at a time, reset between uses and
+    recycled after ``max_uses`` fills or on any fatal error.
+    """
+    
+    def __init__(
+        self,
+        factory: Callable[[], webdriver.Chrome],
+        size: int,
+        max_uses: int
+    ):
+        self._factory = factory
+        self._size = size
+        self._max_uses = max_uses
+        self._idle: "queue.LifoQueue[webdriver.Chrome]" = queue.LifoQueue()
+        self._uses: Dict[webdriver.Chrome, int] = {}
+        self._live = 0  # Drivers launched or launching
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def _reserve(self) -> bool:
+        """Claim capacity for one more driver"""
+        with self._lock:
+            if self._closed or self._live >= self._size:
+                return False
+            self._live += 1
+            return True
+    
+    def _unreserve(self):
+        with self._lock:
+            self._live -= 1
+    
+    def _launch(self) -> webdriver.Chrome:
+        """Launch a driver for capacity claimed with _reserve()"""
+        try:
+            driver = self._factory()
+        except Exception:
+            self._unreserve()
+            raise
+        
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._uses[driver] = 0
+        if closed:
+            self._unreserve()
+            self._quit(driver)
+            raise RuntimeError("Browser pool is closed")
+        return driver
+    
+    def _spawn(self):
+        """Launch a driver into the idle queue if there is spare capacity"""
+        if not self._reserve():
+            return
+        try:
+            self._idle.put(self._launch())
+        except Exception:
+            logger.exception("Could not launch Chrome for the browser pool")
+    
+    def warm_up(self):
+        """Fill the pool with ready drivers (blocking; run in a background thread)"""
+        for _ in range(self._size):
+            self._spawn()
+    
+    def acquire(self, timeout: Optional[float] = None) -> webdriver.Chrome:
+        """Check out a driver, launching one if the pool has spare capacity"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            
+            if self._reserve():
+                return self._launch()
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+            
+            # Wait in short slices so capacity freed by a discarded driver
+            # (e.g. a failed respawn) is noticed, not just idle drivers
+            wait = _ACQUIRE_POLL_INTERVAL
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError("No browser available to fill the form")
+                wait = min(wait, remaining)
+            try:
+                return self._idle.get(timeout=wait)
+            except queue.Empty:
+                continue
+    
+    def release(self, driver: webdriver.Chrome, healthy: bool = True):
+        """Return a driver to the pool, or discard it and launch a replacement"""
+        with self._lock:
+            uses = self._uses[driver] + 1
+            self._uses[driver] = uses
+            closed = self._closed
+        
+        if healthy and not closed and uses < self._max_uses:
+            try:
+                self._reset(driver)
+                self._idle.put(driver)
+                return
+            except Exception:
+                logger.warning("Browser reset failed, replacing driver")
+        
+        self._discard(driver)
+        if not closed:
+            threading.Thread(
+                target=self._spawn, name="form-filler-respawn", daemon=True
+            ).start()
+    
+    @staticmethod
+    def _reset(driver: webdriver.Chrome):
+        """Clear per-fill browser state so the next fill starts clean"""
+        driver.execute_script(
+            "window.localStorage.clear(); window.sessionStorage.clear();"
+        )
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+    
+    def _discard(self, driver: webdriver.Chrome):
+        with self._lock:
+            self._uses.pop(driver, None)
+            self._live -= 1
+        self._quit(driver)
+    
+    @staticmethod
+    def _quit(driver: webdriver.Chrome):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def close(self):
+        """Quit idle drivers; checked-out drivers are quit when released"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+# Process-wide executor for fill jobs, shared by every FormFillerService
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Get the shared fill executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="form-filler"
+                )
+    return _executor
+
+
+def _shutdown_executor():
+    """Cancel queued fill jobs and release the shared executor"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
 
 class FormFillerService:
     """Service for filling scholarship forms using Selenium"""
     
+    # Resolved once per process; ChromeDriverManager probes the network
+    _driver_path: ClassVar[Optional[str]] = None
+    _driver_path_lock: ClassVar[threading.Lock] = threading.Lock()
+    
     def __init__(self):
-        self._settings = get_settings()
-        self._executor = ThreadPoolExecutor(max_workers=2)
+        settings = get_settings()
+        self._form_url = settings.form_url
+        self._settle_timeout = settings.form_settle_timeout
+        self._screenshot_retention_seconds = settings.screenshot_retention_days * 86400
+        pool_size = settings.form_filler_pool_size
+        # Twice the browsers: a worker waiting on page loads can coexist with
+        # one doing local work, and queued jobs wait on the pool, not the executor
+        self._executor = _get_executor(pool_size * 2)
+        self._pool = _BrowserPool(
+            self._create_driver,
+            size=pool_size,
+            max_uses=settings.form_filler_max_uses
+        )
         self._screenshots_dir = os.path.join(os.path.dirname(__file__), "..", "..", "screenshots")
         os.makedirs(self._screenshots_dir, exist_ok=True)
+        # Latest screenshot path per session, so lookups never list the directory
+        self._latest_screenshots: Dict[str, str] = self._index_screenshots()
+        # Fill jobs by ID, with progress the worker thread updates as it goes
+        self._jobs: Dict[str, "asyncio.Future[FillResult]"] = {}
+        self._job_progress: Dict[str, Dict[str, Any]] = {}
+        
+        # Pre-warm browsers off the startup path
+        threading.Thread(
+            target=self._pool.warm_up, name="form-filler-warmup", daemon=True
+        ).start()
+    
+    @classmethod
+    def _get_driver_path(cls) -> str:
+        if cls._driver_path is None:
+            with cls._driver_path_lock:
+                if cls._driver_path is None:
+                    cls._driver_path = ChromeDriverManager().install()
+        return cls._driver_path
     
     def _create_driver(self) -> webdriver.Chrome:
         """Create a headless Chrome driver"""
@@ -37,175 +442,280 @@ class FormFillerService:
         options.add_argument("--window-size=1920,1080")
         options.add_argument("--disable-extensions")
         options.add_argument("--disable-infobars")
+        options.add_argument("--blink-settings=imagesEnabled=false")
         options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+        # driver.get() returns at DOMContentLoaded; readiness is awaited
+        # explicitly (mat-select presence + settled probe) before filling
+        options.page_load_strategy = "eager"
         
-        service = Service(ChromeDriverManager().install())
+        service = Service(self._get_driver_path())
         driver = webdriver.Chrome(service=service, options=options)
+        # Blocking persists on the tab, which the pool reuses across fills.
+        # Screenshots show image/icon placeholders; field values still render.
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
         return driver
     
-    def _js_click(self, driver, wait, xpath: str) -> bool:
+    def close(self):
+        """Cancel queued fills and shut down pooled browsers"""
+        _shutdown_executor()
+        self._pool.close()
+    
+    @staticmethod
+    def _session_id_from_filename(filename: str) -> Optional[str]:
+        """Extract the session ID from a form_{session_id}_{timestamp}.jpg name"""
+        if not (filename.startswith("form_") and filename.endswith(_SCREENSHOT_EXTENSIONS)):
+            return None
+        session_id, sep, _ = filename[len("form_"):].partition("_")
+        return session_id if sep else None
+    
+    def _index_screenshots(self) -> Dict[str, str]:
+        """Scan the screenshots directory once to rebuild the latest-per-session index"""
+        latest: Dict[str, str] = {}
+        # Timestamps sort lexicographically, so a single-pass max per session
+        # finds the newest file without sorting the directory
+        for filename in os.listdir(self._screenshots_dir):
+            session_id = self._session_id_from_filename(filename)
+            if session_id and filename > latest.get(session_id, ""):
+                latest[session_id] = filename
+        return {
+            session_id: os.path.join(self._screenshots_dir, filename)
+            for session_id, filename in latest.items()
+        }
+    
+    def purge_old_screenshots(self) -> int:
+        """Delete screenshots older than the retention period, returns count removed"""
+        cutoff = time.time() - self._screenshot_retention_seconds
+        removed = 0
+        with os.scandir(self._screenshots_dir) as entries:
+            for entry in entries:
+                session_id = self._session_id_from_filename(entry.name)
+                if not session_id:
+                    continue
+                try:
+                    if entry.stat().st_mtime >= cutoff:
+                        continue
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+                removed += 1
+                if self._latest_screenshots.get(session_id) == entry.path:
+                    self._latest_screenshots.pop(session_id, None)
+        return removed
+    
+    async def run_screenshot_cleanup(self, interval_seconds: float = _SCREENSHOT_CLEANUP_INTERVAL):
+        """Purge old screenshots periodically (run as a background task)"""
+        while True:
+            try:
+                removed = await asyncio.to_thread(self.purge_old_screenshots)
+                if removed:
+                    logger.info("Removed %d old screenshots", removed)
+            except OSError:
+                logger.exception("Screenshot cleanup failed")
+            await asyncio.sleep(interval_seconds)
+    
+    def _js_click(self, driver, wait, locator: Tuple[str, str]) -> bool:
         """Click element using JavaScript"""
         try:
-            element = wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
+            element = wait.until(EC.presence_of_element_located(locator))
             driver.execute_script("arguments[0].click();", element)
-            time.sleep(0.8)
             return True
         except Exception as e:
-            print(f"Click failed for {xpath}: {e}")
+            logger.warning("Click failed for %s: %s", locator[1], e)
             return False
     
+    @staticmethod
+    def _select_option(driver, wait, form_field: str, value: str):
+        """Open a mat-select and click the option labelled value"""
+        combo = wait.until(EC.presence_of_element_located((By.ID, form_field)))
+        driver.execute_script("arguments[0].click();", combo)
+        
+        # Waits for the panel to open and the option to render
+        option = wait.until(lambda d: d.execute_script(_JS_FIND_OPTION, value))
+        option.click()
+        wait.until(EC.invisibility_of_element_located(_OVERLAY_BACKDROP))
+    
     def _fill_dob_with_datepicker(self, driver, wait, dob_str: str) -> bool:
         """Fill DOB using Angular Material datepicker"""
         try:
-            # Parse DOB
-            if "/" in dob_str:
-                day, month, year = dob_str.split("/")
-            elif "-" in dob_str:
-                parts = dob_str.split("-")
-                if len(parts[0]) == 4:  # YYYY-MM-DD
-                    year, month, day = parts
-                else:  # DD-MM-YYYY
-                    day, month, year = parts
-            else:
+            parsed = _parse_dob(dob_str)
+            if parsed is None:
                 return False
-            
-            day = str(int(day))  # Remove leading zero
-            month_map = {
-                "01": "JAN", "02": "FEB", "03": "MAR", "04": "APR",
-                "05": "MAY", "06": "JUN", "07": "JUL", "08": "AUG",
-                "09": "SEP", "10": "OCT", "11": "NOV", "12": "DEC"
-            }
-            month_abbr = month_map[month.zfill(2)]
+            day, month_abbr, year = parsed
             
             # Open datepicker
-            self._js_click(driver, wait, '//*[@id="mat-input-1"]')
+            self._js_click(driver, wait, _DOB_INPUT)
             
             # Switch to multi-year view
-            self._js_click(
-                driver, wait,
-                "//mat-calendar[@id='mat-datepicker-0']//button[contains(@class, 'mat-calendar-period-button')]"
-            )
+            self._js_click(driver, wait, _PERIOD_BUTTON)
             
-            wait.until(EC.presence_of_element_located((By.XPATH, "//mat-multi-year-view")))
+            wait.until(EC.presence_of_element_located(_MULTI_YEAR_VIEW))
             
             # Select year
-            self._js_click(
-                driver, wait,
-                f"//mat-multi-year-view//button[@aria-label='{year}' or .//span[contains(text(),'{year}') or normalize-space(.)='{year}']]"
-            )
+            self._js_click(driver, wait, (By.XPATH, _XPATH_YEAR_BUTTON.format(year=year)))
             
             # Select month
-            self._js_click(
-                driver, wait,
-                f"//mat-year-view//button[.//span[contains(text(),'{month_abbr}')]]"
-            )
+            self._js_click(driver, wait, (By.XPATH, _XPATH_MONTH_BUTTON.format(month=month_abbr)))
             
             # Select day
-            self._js_click(
-                driver, wait,
-                f"//mat-month-view//button[.//span[contains(@class, 'mat-calendar-body-cell-content') and normalize-space(text())='{day}']]"
-            )
+            self._js_click(driver, wait, (By.XPATH, _XPATH_DAY_BUTTON.format(day=day)))
+            
+            # Picking the day closes the calendar; wait so its overlay
+            # doesn't swallow the next clicks
+            wait.until(EC.invisibility_of_element_located((By.TAG_NAME, "mat-calendar")))
             
             return True
         except Exception as e:
-            print(f"DOB fill failed: {e}")
+            logger.warning("DOB fill failed: %s", e)
             return False
     
     def _fill_form_sync(
         self, 
         user_data: Dict[str, str], 
-        session_id: str
-    ) -> Tuple[bool, str, List[str], Optional[str]]:
+        session_id: str,
+        progress: Optional[Dict[str, Any]] = None
+    ) -> FillResult:
         """
-        Synchronously fill the form (runs in thread pool).
+        Synchronously fill the form (runs in thread pool) with a pooled browser.
+        
+        Args:
+            user_data: Dictionary of form field values
+            session_id: Session ID for screenshot naming
+            progress: Dict updated in place with the current step and the
+                number of fields filled so far
         
         Returns:
             Tuple of (success, message, errors, screenshot_path)
         """
         driver = None
+        healthy = False
         errors: List[str] = []
         screenshot_path = None
         
+        if progress is None:
+            progress = {}
+        selects = [
+            (user_field, form_field)
+            for user_field, form_field in _SELECT_FIELD_IDS.items()
+            if user_data.get(user_field)
+        ]
+        text_entries = [
+            [field_key, element_id, str(user_data[field_key])]
+            for field_key, element_id in _TEXT_FIELD_IDS.items()
+            if user_data.get(field_key)
+        ]
+        has_dob = bool(user_data.get("dob"))
+        progress.update(
+            step="Waiting for a browser",
+            fields_done=0,
+            fields_total=len(text_entries) + has_dob + len(selects)
+        )
+        
         try:
-            driver = self._create_driver()
-            wait = WebDriverWait(driver, 20)
+            driver = self._pool.acquire(timeout=_ACQUIRE_TIMEOUT)
+            wait = WebDriverWait(driver, 20, poll_frequency=0.1)
             
             # Navigate to form
-            driver.get(self._settings.form_url)
+            progress["step"] = "Loading form"
+            driver.get(self._form_url)
             
             # Wait for form to load
-            WebDriverWait(driver, 15).until(
+            WebDriverWait(driver, 15, poll_frequency=0.1).until(
                 EC.presence_of_all_elements_located((By.TAG_NAME, "mat-select"))
             )
-            time.sleep(2)  # Extra wait for Angular to fully load
+            # Give Angular (or, failing that, the network) a moment to go
+            # idle. Best-effort: some pages never settle (polling, zone-tracked
+            # timers), and the mat-select wait above already shows the form
+            # has rendered.
+            try:
+                WebDriverWait(driver, self._settle_timeout, poll_frequency=0.1).until(
+                    lambda d: d.execute_script(_JS_PAGE_SETTLED, _NETWORK_QUIET_MS)
+                )
+            except TimeoutException:
+                logger.warning(
+                    "Form page did not settle within %gs; filling anyway", self._settle_timeout
+                )
             
-            # Text input fields mapping
-            text_fields = {
-                "name": "mat-input-0",
-                "annual_family_income": "mat-input-2",
-                "xii_roll_no": "mat-input-5",
-                "twelfthPercentage": "mat-input-6",
-                "x_roll_no": "mat-input-8",
-                "tenthPercentage": "mat-input-9",
-                "competitiveRollno": "mat-input-10",
-            }
+            # Fill text inputs in one script round-trip
+            progress["step"] = "Filling text fields"
+            try:
+                failed_keys = set(driver.execute_script(_JS_FILL_TEXT_FIELDS, text_entries))
+            except Exception:
+                failed_keys = {field_key for field_key, _, _ in text_entries}
             
-            # Fill text inputs
-            for field_key, element_id in text_fields.items():
-                if user_data.get(field_key):
+            # Fall back to typing for any field the script couldn't set
+            for field_key, element_id, value in text_entries:
+                if field_key in failed_keys:
                     try:
                         field = driver.find_element(By.ID, element_id)
                         field.clear()
-                        field.send_keys(str(user_data[field_key]))
+                        field.send_keys(value)
                     except Exception as e:
                         errors.append(f"Could not fill {field_key}: {str(e)}")
+            progress["fields_done"] += len(text_entries)
             
             # Fill DOB
-            if user_data.get("dob"):
+            if has_dob:
+                progress["step"] = "Filling date of birth"
                 try:
                     self._fill_dob_with_datepicker(driver, wait, user_data["dob"])
                 except Exception as e:
                     errors.append(f"DOB selection failed: {str(e)}")
+                progress["fields_done"] += 1
             
-            # Select dropdown fields mapping
-            select_fields = {
-                "d_state_id": "mat-select-0",
-                "gender": "mat-select-2",
-                "religion": "mat-select-8",
-                "community": "mat-select-10",
-                "maritalStatus": "mat-select-4",
-                "c_course_id": "mat-select-22",
-                "parent_profession": "mat-select-6",
-                "hosteler": "mat-select-14",
-                "competitiveExam": "mat-select-28",
-            }
+            # Fill select dropdowns in one in-page async script
+            progress["step"] = "Selecting dropdown options"
+            select_entries = [
+                [user_field, form_field, user_data[user_field]]
+                for user_field, form_field in selects
+            ]
+            failed_selects: Optional[Dict[str, str]] = {}
+            if select_entries:
+                try:
+                    # Worst case per select: option wait, close wait, recovery close wait
+                    driver.set_script_timeout(
+                        len(select_entries) * 3 * _SELECT_STEP_TIMEOUT_MS / 1000 + 5
+                    )
+                    results = driver.execute_async_script(
+                        _JS_FILL_SELECTS, select_entries, _SELECT_STEP_TIMEOUT_MS
+                    )
+                    if results is None:
+                        raise RuntimeError("select script failed")
+                    failed_selects = {
+                        r["field"]: r["error"] for r in results if not r["success"]
+                    }
+                except Exception as e:
+                    logger.warning("Batch select failed, selecting one by one: %s", e)
+                    failed_selects = None
             
-            # Fill select dropdowns
-            for user_field, form_field in select_fields.items():
-                if user_data.get(user_field):
+            if failed_selects is None:
+                # Fall back to driving each select from Python
+                for user_field, form_field, value in select_entries:
+                    progress["step"] = f"Selecting {user_field}"
                     try:
-                        combo = wait.until(EC.presence_of_element_located((By.ID, form_field)))
-                        driver.execute_script("arguments[0].click();", combo)
-                        time.sleep(0.5)
-                        
-                        option = wait.until(
-                            EC.element_to_be_clickable((
-                                By.XPATH, 
-                                f"//mat-option//span[text()='{user_data[user_field]}']"
-                            ))
-                        )
-                        option.click()
-                        time.sleep(0.3)
+                        self._select_option(driver, wait, form_field, value)
                     except Exception as e:
                         errors.append(f"Could not select {user_field}: {str(e)}")
+                    progress["fields_done"] += 1
+            else:
+                errors.extend(
+                    f"Could not select {user_field}: {error}"
+                    for user_field, error in failed_selects.items()
+                )
+                progress["fields_done"] += len(select_entries)
             
             # Take screenshot
+            progress["step"] = "Taking screenshot"
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             screenshot_path = os.path.join(
                 self._screenshots_dir, 
-                f"form_{session_id}_{timestamp}.png"
+                f"form_{session_id}_{timestamp}.jpg"
             )
-            driver.save_screenshot(screenshot_path)
+            screenshot = driver.execute_cdp_cmd("Page.captureScreenshot", _SCREENSHOT_PARAMS)
+            with open(screenshot_path, "wb") as f:
+                f.write(pybase64.b64decode(screenshot["data"], validate=False))
+            self._latest_screenshots[session_id] = screenshot_path
+            healthy = True
             
             if errors:
                 return (
@@ -227,18 +737,94 @@ class FormFillerService:
         
         finally:
             if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+                self._pool.release(driver, healthy)
+    
+    def start_fill(self, user_data: Dict[str, str], session_id: str) -> str:
+        """
+        Start filling the form in the background (must be called on the event loop).
+        
+        Args:
+            user_data: Dictionary of form field values
+            session_id: Session ID for screenshot naming
+            
+        Returns:
+            Job ID to pass to get_job_status / await_job
+        """
+        job_id = str(uuid.uuid4())
+        progress: Dict[str, Any] = {"step": "Queued", "fields_done": 0, "fields_total": 0}
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor,
+            self._fill_form_sync,
+            user_data,
+            session_id,
+            progress
+        )
+        self._jobs[job_id] = future
+        self._job_progress[job_id] = progress
+        # Finished jobs stay queryable for a while, then are dropped
+        future.add_done_callback(
+            lambda _: loop.call_later(_JOB_RETENTION, self._forget_job, job_id)
+        )
+        return job_id
+    
+    def _forget_job(self, job_id: str):
+        self._jobs.pop(job_id, None)
+        self._job_progress.pop(job_id, None)
+    
+    def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a snapshot of a fill job.
+        
+        Returns:
+            Dict with "done", "progress" and, once done, "result"
+            (success, message, errors, screenshot_path); None if unknown
+        """
+        future = self._jobs.get(job_id)
+        if future is None:
+            return None
+        status: Dict[str, Any] = {
+            "done": future.done(),
+            "progress": dict(self._job_progress.get(job_id, {}))
+        }
+        if future.done():
+            status["result"] = self._job_result(future)
+        return status
+    
+    async def await_job(self, job_id: str, timeout: Optional[float] = None) -> Optional[FillResult]:
+        """
+        Wait for a fill job to finish.
+        
+        Returns:
+            Tuple of (success, message, errors, screenshot_path), or None if
+            the job is unknown or still running after timeout seconds
+        """
+        future = self._jobs.get(job_id)
+        if future is None:
+            return None
+        try:
+            # shield: a timed-out wait must not cancel the job itself
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return None
+        except Exception:
+            pass
+        return self._job_result(future)
+    
+    @staticmethod
+    def _job_result(future: "asyncio.Future[FillResult]") -> FillResult:
+        exc = future.exception()
+        if exc is not None:
+            return (False, f"Form filling failed: {exc}", [str(exc)], None)
+        return future.result()
     
     async def fill_form(
         self, 
         user_data: Dict[str, str], 
         session_id: str
-    ) -> Tuple[bool, str, List[str], Optional[str]]:
+    ) -> FillResult:
         """
-        Fill the scholarship form with provided data.
+        Fill the scholarship form with provided data and wait for the result.
         
         Args:
             user_data: Dictionary of form field values
@@ -247,24 +833,8 @@ class FormFillerService:
         Returns:
             Tuple of (success, message, errors, screenshot_path)
         """
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self._executor,
-            self._fill_form_sync,
-            user_data,
-            session_id
-        )
+        return await self.await_job(self.start_fill(user_data, session_id))
     
     def get_screenshot_path(self, session_id: str) -> Optional[str]:
         """Get the latest screenshot for a session"""
-        try:
-            screenshots = [
-                f for f in os.listdir(self._screenshots_dir)
-                if f.startswith(f"form_{session_id}_") and f.endswith(".png")
-            ]
-            if screenshots:
-                screenshots.sort(reverse=True)
-                return os.path.join(self._screenshots_dir, screenshots[0])
-            return None
-        except:
-            return None
+        return self._latest_screenshots.get(session_id)
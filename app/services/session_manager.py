@@ -1,12 +1,26 @@
 """Session management service with in-memory storage"""
+import asyncio
+import os
+import time
 import uuid
 import threading
-from datetime import datetime, timedelta
-from typing import Dict, Optional, List, Any
-from functools import lru_cache
+from collections import deque
+from types import MappingProxyType
+from typing import Deque, Dict, Optional, List, Any, Mapping, Tuple
 
 from ..config import get_settings
-from ..models import SessionStatus, ExtractedData
+from ..models import SessionStatus, ExtractedData, ExtractedDataDict
+
+# Chat history kept per session (and sent to the LLM as context)
+MAX_HISTORY_MESSAGES = 12
+MAX_MESSAGE_CHARS = 2000
+
+# How often the background task sweeps expired sessions
+CLEANUP_INTERVAL_SECONDS = 60.0
+
+_VALID_FIELDS = frozenset(ExtractedDataDict.__annotations__)
+# Values the LLM uses for "unknown"; only strings are checked against these
+_NULL_SENTINELS = frozenset(("null", "NULL", "", None))
 
 
 class Session:
@@ -15,11 +29,11 @@ class Session:
     def __init__(self, session_id: str):
         self.session_id = session_id
         self.status = SessionStatus.ACTIVE
-        self.created_at = datetime.utcnow()
-        self.last_activity = datetime.utcnow()
+        self.created_at = time.time()  # Unix timestamp, formatted at the API boundary
+        self.last_activity = time.monotonic()  # Only compared against other monotonic readings
         self.group_index = 0
-        self.chat_history: List[Dict[str, str]] = []
-        self.data: Dict[str, Optional[str]] = {
+        self.chat_history: Deque[Dict[str, str]] = deque(maxlen=MAX_HISTORY_MESSAGES)
+        self.data: ExtractedDataDict = {
             "name": None, 
             "gender": None, 
             "d_state_id": None, 
@@ -38,48 +52,100 @@ class Session:
             "competitiveExam": None, 
             "competitiveRollno": None
         }
+        self._filled_data_cache: Optional[Dict[str, str]] = None
         self.form_filling_status = "pending"
+        self.form_job_id: Optional[str] = None
         self.form_screenshot_path: Optional[str] = None
+        self.form_screenshot_stat: Optional[os.stat_result] = None
         self.form_errors: List[str] = []
     
     def update_activity(self):
         """Update last activity timestamp"""
-        self.last_activity = datetime.utcnow()
+        self.last_activity = time.monotonic()
     
     def add_message(self, role: str, content: str):
-        """Add message to chat history"""
-        self.chat_history.append({"role": role, "content": content})
+        """Add message to chat history (oldest messages drop off automatically)"""
+        self._append_message(role, content)
         self.update_activity()
     
     def update_data(self, new_data: Dict[str, Any]) -> List[str]:
         """Update extracted data, returns list of updated fields"""
+        updated_fields = self._merge_data(new_data)
+        self.update_activity()
+        return updated_fields
+    
+    def commit_turn(
+        self,
+        user_text: str,
+        extracted_data: Optional[Dict[str, Any]],
+        assistant_text: Optional[str] = None
+    ) -> List[str]:
+        """
+        Record a completed conversation turn in one step: the user message,
+        the extracted data, the assistant reply and the move to the next
+        question group. Nothing here awaits, so other coroutines never see a
+        half-applied turn.
+        
+        Returns:
+            List of updated fields
+        """
+        self._append_message("user", user_text)
+        updated_fields = self._merge_data(extracted_data) if extracted_data else []
+        if assistant_text:
+            self._append_message("assistant", assistant_text)
+        self.group_index += 1
+        self.update_activity()
+        return updated_fields
+    
+    def _append_message(self, role: str, content: str):
+        self.chat_history.append({"role": role, "content": content[:MAX_MESSAGE_CHARS]})
+    
+    def _merge_data(self, new_data: Dict[str, Any]) -> List[str]:
         updated_fields = []
+        data = self.data
         for key, value in new_data.items():
-            if key in self.data and value and value not in ("null", "NULL", "", None):
+            if not value or key not in _VALID_FIELDS:
+                continue
+            if isinstance(value, str):
+                if value in _NULL_SENTINELS:
+                    continue
+                clean_value = value.strip()
+            else:
                 clean_value = str(value).strip()
-                if self.data[key] != clean_value:
-                    self.data[key] = clean_value
-                    updated_fields.append(key)
-        self.update_activity()
+            if data[key] != clean_value:
+                data[key] = clean_value
+                updated_fields.append(key)
+        if updated_fields:
+            self._filled_data_cache = None
         return updated_fields
     
     def get_filled_data(self) -> Dict[str, str]:
-        """Get only the filled data fields"""
-        return {k: v for k, v in self.data.items() if v is not None}
+        """Get only the filled data fields (cached until the data changes; don't mutate)"""
+        if self._filled_data_cache is None:
+            self._filled_data_cache = {k: v for k, v in self.data.items() if v is not None}
+        return self._filled_data_cache
     
     def get_extracted_data(self) -> ExtractedData:
-        """Get data as ExtractedData model"""
-        return ExtractedData(**self.data)
+        """Get data as ExtractedData model (values are already clean strings)"""
+        return ExtractedData.model_construct(**self.data)
     
     def advance_group(self):
         """Move to next question group"""
         self.group_index += 1
         self.update_activity()
     
-    def is_expired(self, timeout_minutes: int) -> bool:
+    def is_expired(self, timeout_seconds: float) -> bool:
         """Check if session has expired"""
-        expiry_time = self.last_activity + timedelta(minutes=timeout_minutes)
-        return datetime.utcnow() > expiry_time
+        return time.monotonic() - self.last_activity > timeout_seconds
+
+
+def _precompute_groups(groups: List[Dict[str, Any]]) -> Tuple[Mapping[str, Any], ...]:
+    """Build a read-only question group payload for each group index"""
+    last = len(groups) - 1
+    return tuple(
+        MappingProxyType({**group, "group_index": i, "is_last": i == last})
+        for i, group in enumerate(groups)
+    )
 
 
 class SessionManager:
@@ -131,10 +197,15 @@ class SessionManager:
         }
     ]
     
+    NUM_GROUPS = len(QUESTION_GROUPS)
+    
+    # Read-only response payloads for each group, built once at class load
+    _PRECOMPUTED_GROUPS = _precompute_groups(QUESTION_GROUPS)
+    
     def __init__(self):
         self._sessions: Dict[str, Session] = {}
         self._lock = threading.Lock()
-        self._settings = get_settings()
+        self._session_timeout_seconds = get_settings().session_timeout_minutes * 60
     
     def create_session(self) -> Session:
         """Create a new session"""
@@ -143,20 +214,18 @@ class SessionManager:
         
         with self._lock:
             self._sessions[session_id] = session
-            self._cleanup_expired()
         
         return session
     
     def get_session(self, session_id: str) -> Optional[Session]:
-        """Get session by ID"""
-        with self._lock:
-            session = self._sessions.get(session_id)
-            if session:
-                if session.is_expired(self._settings.session_timeout_minutes):
-                    session.status = SessionStatus.EXPIRED
-                    return None
-                session.update_activity()
-            return session
+        """Get session by ID (lock-free: single-key dict reads are atomic)"""
+        session = self._sessions.get(session_id)
+        if session:
+            if session.is_expired(self._session_timeout_seconds):
+                session.status = SessionStatus.EXPIRED
+                return None
+            session.update_activity()
+        return session
     
     def delete_session(self, session_id: str) -> bool:
         """Delete a session"""
@@ -166,50 +235,48 @@ class SessionManager:
                 return True
             return False
     
-    def get_current_questions(self, session_id: str) -> Optional[Dict]:
-        """Get current question group for session"""
+    def get_current_questions(self, session_id: str) -> Optional[Mapping[str, Any]]:
+        """Get current question group for session (read-only mapping)"""
         session = self.get_session(session_id)
-        if not session:
+        if not session or session.group_index >= self.NUM_GROUPS:
             return None
-        
-        if session.group_index >= len(self.QUESTION_GROUPS):
-            return None
-        
-        group = self.QUESTION_GROUPS[session.group_index]
-        return {
-            "title": group["title"],
-            "intro": group["intro"],
-            "questions": group["questions"],
-            "group_index": session.group_index,
-            "is_last": session.group_index >= len(self.QUESTION_GROUPS) - 1
-        }
+        return self._PRECOMPUTED_GROUPS[session.group_index]
     
     def is_finished(self, session_id: str) -> bool:
         """Check if all question groups are completed"""
         session = self.get_session(session_id)
         if not session:
             return True
-        return session.group_index >= len(self.QUESTION_GROUPS)
+        return session.group_index >= self.NUM_GROUPS
+    
+    def cleanup_expired(self):
+        """Remove expired sessions"""
+        with self._lock:
+            # Sessions idle since before this instant have expired
+            cutoff = time.monotonic() - self._session_timeout_seconds
+            expired = [
+                sid for sid, session in self._sessions.items()
+                if session.last_activity < cutoff
+            ]
+            for sid in expired:
+                del self._sessions[sid]
     
-    def _cleanup_expired(self):
-        """Remove expired sessions (called internally with lock held)"""
-        expired = [
-            sid for sid, session in self._sessions.items()
-            if session.is_expired(self._settings.session_timeout_minutes)
-        ]
-        for sid in expired:
-            del self._sessions[sid]
+    async def run_cleanup(self, interval_seconds: float = CLEANUP_INTERVAL_SECONDS):
+        """Sweep expired sessions periodically (run as a background task)"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            self.cleanup_expired()
     
     def get_stats(self) -> Dict:
         """Get session statistics"""
-        with self._lock:
-            return {
-                "total_sessions": len(self._sessions),
-                "active_sessions": sum(
-                    1 for s in self._sessions.values() 
-                    if s.status == SessionStatus.ACTIVE
-                )
-            }
+        sessions = list(self._sessions.values())  # Atomic snapshot, no lock needed
+        return {
+            "total_sessions": len(sessions),
+            "active_sessions": sum(
+                1 for s in sessions 
+                if s.status == SessionStatus.ACTIVE
+            )
+        }
 
 
 # Singleton instance
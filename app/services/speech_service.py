@@ -1,79 +1,185 @@
 """Speech-to-text service using Bhashini API"""
-import base64
+import asyncio
 import io
+import logging
+import math
+import tempfile
 import httpx
-from typing import Optional
+import numpy as np
+import orjson
+import pybase64
+import soundfile as sf
+from scipy.signal import resample_poly
+from typing import AsyncIterator, BinaryIO, Optional, Tuple
 
 from ..config import get_settings
 
+logger = logging.getLogger(__name__)
+
+# Raw audio bytes read per chunk (a multiple of 3 keeps base64 chunks aligned)
+_AUDIO_CHUNK_SIZE = 3 * 21845
+# Request bodies larger than this are spooled to disk
+_SPOOL_MAX_SIZE = 1024 * 1024
+
+# Audio format the ASR pipeline is configured for
+_ASR_SAMPLE_RATE = 16000
+
+_AUDIO_PLACEHOLDER = "__AUDIO_CONTENT__"
+
+# ASR payload split around the audio content so it can be streamed in between
+_ASR_PAYLOAD_PREFIX, _ASR_PAYLOAD_SUFFIX = orjson.dumps({
+    "pipelineTasks": [{
+        "taskType": "asr",
+        "config": {
+            "language": {"sourceLanguage": "en"},
+            "serviceId": "ai4bharat/whisper-medium-en--gpu--t4",
+            "audioFormat": "wav",
+            "samplingRate": _ASR_SAMPLE_RATE,
+            "preProcessors": ["vad"],
+            "postProcessors": ["itn"]
+        }
+    }],
+    "inputData": {
+        "audio": [{"audioContent": _AUDIO_PLACEHOLDER}]
+    }
+}).split(_AUDIO_PLACEHOLDER.encode("utf-8"))
+
+
+def _to_asr_wav(audio: BinaryIO) -> BinaryIO:
+    """
+    Transcode audio to 16 kHz mono 16-bit WAV for the ASR pipeline.
+    
+    Audio already in that format, or in a container libsndfile can't
+    decode (e.g. WebM), is returned unchanged.
+    """
+    audio.seek(0)
+    try:
+        info = sf.info(audio)
+    except RuntimeError:  # soundfile's LibsndfileError subclasses RuntimeError
+        audio.seek(0)
+        return audio
+    if (info.format == "WAV" and info.subtype == "PCM_16"
+            and info.samplerate == _ASR_SAMPLE_RATE and info.channels == 1):
+        audio.seek(0)
+        return audio
+    
+    audio.seek(0)
+    data, sample_rate = sf.read(audio, dtype="float32", always_2d=True)
+    samples = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+    if sample_rate != _ASR_SAMPLE_RATE:
+        g = math.gcd(sample_rate, _ASR_SAMPLE_RATE)
+        samples = resample_poly(samples, _ASR_SAMPLE_RATE // g, sample_rate // g)
+    
+    out = io.BytesIO()
+    sf.write(out, np.clip(samples, -1.0, 1.0), _ASR_SAMPLE_RATE, subtype="PCM_16", format="WAV")
+    out.seek(0)
+    return out
+
+
+async def _aiter_file(f: BinaryIO, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Read a file in chunks off the event loop"""
+    while chunk := await asyncio.to_thread(f.read, chunk_size):
+        yield chunk
+
 
 class SpeechService:
     """Service for speech-to-text conversion using Bhashini API"""
     
     def __init__(self):
-        self._settings = get_settings()
+        settings = get_settings()
+        self._bhashini_url = settings.bhashini_url
+        self._headers = {
+            "Authorization": settings.bhashini_key,
+            "Content-Type": "application/json"
+        }
+        self._client: Optional[httpx.AsyncClient] = None
     
-    async def transcribe_audio(self, audio_bytes: bytes) -> Optional[str]:
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled Bhashini client, creating it on first use"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60),
+                http2=True
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the pooled client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def transcribe_audio(self, audio: BinaryIO) -> Optional[str]:
         """
-        Transcribe audio bytes to text using Bhashini ASR.
+        Transcribe audio to text using Bhashini ASR.
+        
+        Audio that isn't already 16 kHz mono 16-bit WAV is transcoded to it
+        first, which can shrink the payload many times over. The audio is then
+        base64-encoded chunk by chunk into a spooled request body and streamed
+        to Bhashini, so the encoded payload is never held in memory as one
+        bytes/str object.
         
         Args:
-            audio_bytes: Raw audio bytes (WAV format expected)
+            audio: Readable binary file object with the audio (any format
+                libsndfile reads; other formats are sent as-is)
             
         Returns:
             Transcribed text or None if failed
         """
-        # Encode audio to base64
-        audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
-        
-        payload = {
-            "pipelineTasks": [{
-                "taskType": "asr",
-                "config": {
-                    "language": {"sourceLanguage": "en"},
-                    "serviceId": "ai4bharat/whisper-medium-en--gpu--t4",
-                    "audioFormat": "wav",
-                    "samplingRate": 16000,
-                    "preProcessors": ["vad"],
-                    "postProcessors": ["itn"]
-                }
-            }],
-            "inputData": {
-                "audio": [{"audioContent": audio_b64}]
-            }
-        }
-        
-        headers = {
-            "Authorization": self._settings.bhashini_key,
-            "Content-Type": "application/json"
-        }
-        
+        body = None
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self._settings.bhashini_url,
-                    json=payload,
-                    headers=headers
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                # Extract transcribed text
-                text = (
-                    result.get("pipelineResponse", [{}])[0]
-                    .get("output", [{}])[0]
-                    .get("source", "")
-                    .strip()
-                )
-                
-                return text if text else None
-                
-        except httpx.HTTPError as e:
-            print(f"Bhashini API error: {e}")
+            body, length = await asyncio.to_thread(self._spool_asr_body, audio)
+            
+            client = await self._get_client()
+            response = await client.post(
+                self._bhashini_url,
+                content=_aiter_file(body),
+                headers={**self._headers, "Content-Length": str(length)}
+            )
+            response.raise_for_status()
+            result = orjson.loads(response.content)
+            
+            # Extract transcribed text
+            text = (
+                result.get("pipelineResponse", [{}])[0]
+                .get("output", [{}])[0]
+                .get("source", "")
+                .strip()
+            )
+            
+            return text if text else None
+            
+        except httpx.HTTPError:
+            logger.exception("Bhashini API error")
             return None
-        except Exception as e:
-            print(f"Transcription error: {e}")
+        except Exception:
+            logger.exception("Transcription error")
             return None
+        finally:
+            if body is not None:
+                body.close()
+    
+    @staticmethod
+    def _spool_asr_body(audio: BinaryIO) -> Tuple[BinaryIO, int]:
+        """Write the ASR JSON payload with base64 audio to a spooled temp file"""
+        audio = _to_asr_wav(audio)
+        body = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
+        body.write(_ASR_PAYLOAD_PREFIX)
+        
+        pending = b""
+        while chunk := audio.read(_AUDIO_CHUNK_SIZE):
+            pending += chunk
+            # Encode only whole 3-byte groups so no padding appears mid-stream
+            usable = len(pending) - len(pending) % 3
+            body.write(pybase64.b64encode(pending[:usable]))
+            pending = pending[usable:]
+        body.write(pybase64.b64encode(pending))
+        
+        body.write(_ASR_PAYLOAD_SUFFIX)
+        length = body.tell()
+        body.seek(0)
+        return body, length
     
     async def text_to_speech(self, text: str, gender: str = "female") -> Optional[bytes]:
         """
@@ -100,42 +206,37 @@ class SpeechService:
             }
         }
         
-        headers = {
-            "Authorization": self._settings.bhashini_key,
-            "Content-Type": "application/json"
-        }
-        
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self._settings.bhashini_url,
-                    json=payload,
-                    headers=headers
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                # Extract audio content
-                audio_b64 = (
-                    result.get("pipelineResponse", [{}])[0]
-                    .get("audio", [{}])[0]
-                    .get("audioContent", "")
-                )
-                
-                if audio_b64:
-                    return base64.b64decode(audio_b64)
-                return None
-                
-        except Exception as e:
-            print(f"TTS error: {e}")
+            client = await self._get_client()
+            response = await client.post(
+                self._bhashini_url,
+                content=orjson.dumps(payload),
+                headers=self._headers
+            )
+            response.raise_for_status()
+            result = orjson.loads(response.content)
+            
+            # Extract audio content
+            audio_b64 = (
+                result.get("pipelineResponse", [{}])[0]
+                .get("audio", [{}])[0]
+                .get("audioContent", "")
+            )
+            
+            if audio_b64:
+                return pybase64.b64decode(audio_b64, validate=False)
+            return None
+            
+        except Exception:
+            logger.exception("TTS error")
             return None
     
     async def check_health(self) -> bool:
         """Check if Bhashini API is accessible"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                # Just check if we can reach the endpoint
-                response = await client.options(self._settings.bhashini_url)
-                return response.status_code < 500
+            client = await self._get_client()
+            # Just check if we can reach the endpoint
+            response = await client.options(self._bhashini_url, timeout=5.0)
+            return response.status_code < 500
         except Exception:
             return False